@@ -3,9 +3,8 @@
 from datetime import datetime, timedelta
 from logging import Logger, getLogger
 from time import sleep
-from typing import Callable, List, Set, TypeVar
+from typing import Callable, List, Set, Tuple, TypeVar
 
-from google.protobuf.internal.containers import RepeatedScalarFieldContainer
 from grpc import Channel, insecure_channel
 from mock_collector_service_pb2 import (
     ClearRequest,
@@ -69,23 +68,8 @@ class MockCollectorClient:
             List of `ResourceScopeSpan` which is essentially a flat list containing all the spans and their related
             scope and resources.
         """
-
-        def get_export() -> List[ExportTraceServiceRequest]:
-            response: GetTracesResponse = self.client.get_traces(GetTracesRequest())
-            serialized_traces: RepeatedScalarFieldContainer[bytes] = response.traces
-            return list(map(ExportTraceServiceRequest.FromString, serialized_traces))
-
-        def wait_condition(exported: List[ExportTraceServiceRequest], current: List[ExportTraceServiceRequest]) -> bool:
-            return 0 < len(exported) == len(current)
-
-        exported_traces: List[ExportTraceServiceRequest] = _wait_for_content(get_export, wait_condition)
-        spans: List[ResourceScopeSpan] = []
-        for exported_trace in exported_traces:
-            for resource_span in exported_trace.resource_spans:
-                for scope_span in resource_span.scope_spans:
-                    for span in scope_span.spans:
-                        spans.append(ResourceScopeSpan(resource_span, scope_span, span))
-        return spans
+        serialized_traces: List[bytes] = _wait_for_content(self._get_serialized_traces, _traces_wait_condition, [])
+        return _flatten_traces(serialized_traces)
 
     def get_metrics(self, present_metrics: Set[str]) -> List[ResourceScopeMetric]:
         """Get all metrics that are currently stored in the mock collector.
@@ -94,43 +78,97 @@ class MockCollectorClient:
              List of `ResourceScopeMetric` which is a flat list containing all metrics and their related scope and
              resources.
         """
+        serialized_metrics: List[bytes] = _wait_for_content(
+            self._get_serialized_metrics, _metrics_wait_condition(present_metrics), []
+        )
+        return _flatten_metrics(serialized_metrics)
+
+    def get_traces_and_metrics(
+        self, present_metrics: Set[str]
+    ) -> Tuple[List[ResourceScopeSpan], List[ResourceScopeMetric]]:
+        """Get all traces and metrics that are currently stored in the mock collector.
+
+        Both signals are polled in a single wait loop, rather than waiting for traces and then for metrics.
+
+        Returns:
+            Tuple of the flat `ResourceScopeSpan` and `ResourceScopeMetric` lists, as returned by `get_traces` and
+            `get_metrics`.
+        """
+        metrics_wait_condition: Callable[[List[bytes], List[bytes]], bool] = _metrics_wait_condition(present_metrics)
+
+        def get_export() -> Tuple[List[bytes], List[bytes]]:
+            return self._get_serialized_traces(), self._get_serialized_metrics()
+
+        def wait_condition(exported: Tuple[List[bytes], List[bytes]], current: Tuple[List[bytes], List[bytes]]) -> bool:
+            return _traces_wait_condition(exported[0], current[0]) and metrics_wait_condition(exported[1], current[1])
+
+        serialized_traces, serialized_metrics = _wait_for_content(get_export, wait_condition, ([], []))
+        return _flatten_traces(serialized_traces), _flatten_metrics(serialized_metrics)
 
-        present_metrics_lower: Set[str] = {s.lower() for s in present_metrics}
-
-        def get_export() -> List[ExportMetricsServiceRequest]:
-            response: GetMetricsResponse = self.client.get_metrics(GetMetricsRequest())
-            serialized_metrics: RepeatedScalarFieldContainer[bytes] = response.metrics
-            return list(map(ExportMetricsServiceRequest.FromString, serialized_metrics))
-
-        def wait_condition(
-            exported: List[ExportMetricsServiceRequest], current: List[ExportMetricsServiceRequest]
-        ) -> bool:
-            received_metrics: Set[str] = set()
-            for exported_metric in current:
-                for resource_metric in exported_metric.resource_metrics:
-                    for scope_metric in resource_metric.scope_metrics:
-                        for metric in scope_metric.metrics:
-                            received_metrics.add(metric.name.lower())
-            return 0 < len(exported) == (len(current) - 2) and present_metrics_lower.issubset(received_metrics)
-
-        exported_metrics: List[ExportMetricsServiceRequest] = _wait_for_content(get_export, wait_condition)
-        metrics: List[ResourceScopeMetric] = []
-        for exported_metric in exported_metrics:
-            for resource_metric in exported_metric.resource_metrics:
+    # Exports are kept serialized while waiting for content, and only parsed once the wait is over.
+    def _get_serialized_traces(self) -> List[bytes]:
+        response: GetTracesResponse = self.client.get_traces(GetTracesRequest())
+        return list(response.traces)
+
+    def _get_serialized_metrics(self) -> List[bytes]:
+        response: GetMetricsResponse = self.client.get_metrics(GetMetricsRequest())
+        return list(response.metrics)
+
+
+def _traces_wait_condition(exported: List[bytes], current: List[bytes]) -> bool:
+    return 0 < len(exported) == len(current)
+
+
+def _metrics_wait_condition(present_metrics: Set[str]) -> Callable[[List[bytes], List[bytes]], bool]:
+    missing_metrics: Set[str] = {s.lower() for s in present_metrics}
+    parsed_count: int = 0
+
+    def wait_condition(exported: List[bytes], current: List[bytes]) -> bool:
+        nonlocal parsed_count
+        # The collector only appends exports until it is cleared, so only parse the ones not seen by a previous poll.
+        # Once every expected metric has been received, the remaining polls only wait for the export count to settle,
+        # so there is nothing left to parse.
+        for serialized_metric in current[parsed_count:]:
+            if not missing_metrics:
+                break
+            for resource_metric in ExportMetricsServiceRequest.FromString(serialized_metric).resource_metrics:
                 for scope_metric in resource_metric.scope_metrics:
                     for metric in scope_metric.metrics:
-                        metrics.append(ResourceScopeMetric(resource_metric, scope_metric, metric))
-        return metrics
+                        missing_metrics.discard(metric.name.lower())
+        parsed_count = len(current)
+        return 0 < len(exported) == (len(current) - 2) and not missing_metrics
+
+    return wait_condition
+
+
+def _flatten_traces(serialized_traces: List[bytes]) -> List[ResourceScopeSpan]:
+    spans: List[ResourceScopeSpan] = []
+    for exported_trace in map(ExportTraceServiceRequest.FromString, serialized_traces):
+        for resource_span in exported_trace.resource_spans:
+            for scope_span in resource_span.scope_spans:
+                for span in scope_span.spans:
+                    spans.append(ResourceScopeSpan(resource_span, scope_span, span))
+    return spans
+
+
+def _flatten_metrics(serialized_metrics: List[bytes]) -> List[ResourceScopeMetric]:
+    metrics: List[ResourceScopeMetric] = []
+    for exported_metric in map(ExportMetricsServiceRequest.FromString, serialized_metrics):
+        for resource_metric in exported_metric.resource_metrics:
+            for scope_metric in resource_metric.scope_metrics:
+                for metric in scope_metric.metrics:
+                    metrics.append(ResourceScopeMetric(resource_metric, scope_metric, metric))
+    return metrics
 
 
-def _wait_for_content(get_export: Callable[[], List[T]], wait_condition: Callable[[List[T], List[T]], bool]) -> List[T]:
+def _wait_for_content(get_export: Callable[[], T], wait_condition: Callable[[T, T], bool], initial: T) -> T:
     # Verify that there is no more data to be received
     deadline: datetime = datetime.now() + _TIMEOUT_DELAY
-    exported: List[T] = []
+    exported: T = initial
 
     while deadline > datetime.now():
         try:
-            current_exported: List[T] = get_export()
+            current_exported: T = get_export()
             if wait_condition(exported, current_exported):
                 return current_exported
             exported = current_exported
@@ -0,0 +1,38 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+import os
+
+import pytest
+
+from amazon.base.contract_test_base import ContractTestBase
+from amazon.utils.docker_images import prefetch_images
+
+
+def pytest_collection_finish(session):
+    # Start after collection rather than at session start: the pulls have nothing to overlap with when only collecting,
+    # and pull threads running while pytest rewrites test module asserts can trip a CPython 3.11 bug in the ast module.
+    if session.config.option.collectonly:
+        return
+    # Every pytest-xdist worker collects all the tests, but the workers share one docker daemon, so only the first one
+    # prefetches. The others do not wait for it: one starting a container before the image is there pulls it itself,
+    # and the daemon shares the layers already being downloaded between concurrent pulls.
+    if os.environ.get("PYTEST_XDIST_WORKER", "gw0") != "gw0":
+        return
+    # Only pull the images of the classes that have selected tests, in the order the classes run.
+    images = dict.fromkeys(
+        image for item in session.items if item.cls is not None for image in getattr(item.cls, "DEPENDENCY_IMAGES", ())
+    )
+    prefetch_images(*images)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    # Let test classes know whether any of their tests failed, so they only dump container logs when needed.
+    if report.failed and item.cls is not None:
+        item.cls.has_failed_test = True
+        # unittest runs a test's cleanups, and so ContractTestBase.tear_down, before this report is made, so the logs
+        # of a failing test's reused application are shown from here.
+        if report.when == "call" and issubclass(item.cls, ContractTestBase):
+            item.cls.log_application_tail()
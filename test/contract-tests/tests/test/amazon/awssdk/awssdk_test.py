@@ -1,14 +1,23 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
+import re
+import time
+from dataclasses import dataclass
 from logging import INFO, Logger, getLogger
-from typing import Dict, List
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Final, FrozenSet, List, Mapping, Optional, Pattern, Tuple, Union
+
+from docker.models.containers import Container
 from docker.types import EndpointConfig
 from mock_collector_client import ResourceScopeMetric, ResourceScopeSpan
+from requests import RequestException, Response, request
+from testcontainers.core.container import DockerContainer
 from testcontainers.localstack import LocalStackContainer
 from typing_extensions import override
 
-from amazon.base.contract_test_base import NETWORK_NAME, ContractTestBase
+from amazon.base.contract_test_base import CONTAINER_CPU_SHARES, NETWORK_NAME, ContractTestBase, get_container_name
 from amazon.utils.application_signals_constants import (
+    AWS_LOCAL_OPERATION,
     AWS_LOCAL_SERVICE,
     AWS_REMOTE_OPERATION,
     AWS_REMOTE_RESOURCE_IDENTIFIER,
@@ -16,7 +25,8 @@ from amazon.utils.application_signals_constants import (
     AWS_REMOTE_SERVICE,
     AWS_SPAN_KIND,
 )
-from opentelemetry.proto.common.v1.common_pb2 import AnyValue, KeyValue
+from amazon.utils.docker_images import LOCAL_STACK_IMAGE, wait_for_image
+from opentelemetry.proto.common.v1.common_pb2 import AnyValue
 from opentelemetry.proto.metrics.v1.metrics_pb2 import ExponentialHistogramDataPoint, Metric
 from opentelemetry.proto.trace.v1.trace_pb2 import Span
 from opentelemetry.semconv.trace import SpanAttributes
@@ -24,6 +34,42 @@ from opentelemetry.semconv.trace import SpanAttributes
 _logger: Logger = getLogger(__name__)
 _logger.setLevel(INFO)
 
+_LOCAL_STACK_LOG_TAIL: int = 2000
+_LOCAL_STACK_STARTUP_TIMEOUT_SEC: float = 60
+_LOCAL_STACK_HEALTH_INTERVAL_SEC: float = 0.5
+_LOCAL_STACK_READY_STATES: Tuple[str, ...] = ("running", "available")
+_LOCAL_STACK_ENDPOINT_CONFIG: EndpointConfig = EndpointConfig(version="1.22", aliases=("localstack", "s3.localstack"))
+_LOCAL_STACK_NETWORKING_CONFIG: Dict[str, EndpointConfig] = {NETWORK_NAME: _LOCAL_STACK_ENDPOINT_CONFIG}
+
+_APPLICATION_ENVIRONMENT_VARIABLES: Final[Mapping[str, str]] = MappingProxyType(
+    {
+        "AWS_SDK_S3_ENDPOINT": "http://s3.localstack:4566",
+        "AWS_SDK_ENDPOINT": "http://localstack:4566",
+        "AWS_REGION": "us-west-2",
+        "AWS_ACCESS_KEY_ID": "testcontainers-localstack",
+        "AWS_SECRET_ACCESS_KEY": "testcontainers-localstack",
+    }
+)
+
+_APPLICATION_NETWORK_ALIASES: Final[Tuple[str, ...]] = ("error.test", "fault.test")
+
+_ValueAssertion = Callable[[Dict[str, AnyValue], str, Any], None]
+# Name of the assertion method for each type of expected request specific attribute value, in the order subclasses of
+# these types are matched against them; other values are single element lists.
+_VALUE_ASSERTIONS: Final[Mapping[type, str]] = MappingProxyType(
+    {
+        str: "_assert_str_attribute",
+        re.Pattern: "_assert_str_attribute",
+        int: "_assert_int_attribute",
+        float: "_assert_float_attribute",
+    }
+)
+
+# Local operations of the requests the sample app answers itself to mock Bedrock; their metrics are not under test.
+_BEDROCK_CALLS: Final[FrozenSet[str]] = frozenset(
+    {"GET /agents", "GET /guardrails", "GET /knowledgebases", "POST /agents", "POST /model", "POST /knowledgebases"}
+)
+
 _AWS_SQS_QUEUE_URL: str = "aws.queue_url"
 _AWS_SQS_QUEUE_NAME: str = "aws.sqs.queue_name"
 _AWS_KINESIS_STREAM_NAME: str = "aws.kinesis.stream_name"
@@ -33,23 +79,335 @@ _AWS_BEDROCK_KNOWLEDGE_BASE_ID: str = "aws.bedrock.knowledge_base.id"
 _AWS_BEDROCK_DATA_SOURCE_ID: str = "aws.bedrock.data_source.id"
 _GEN_AI_REQUEST_MODEL: str = "gen_ai.request.model"
 
+# Request specific span attributes, shared by the cases below that touch the same resource.
+_S3_BUCKET_ATTRIBUTES: Mapping[str, Any] = MappingProxyType({SpanAttributes.AWS_S3_BUCKET: "test-bucket-name"})
+_DYNAMODB_TABLE_ATTRIBUTES: Mapping[str, Any] = MappingProxyType(
+    {
+        # SpanAttributes.AWS_DYNAMODB_TABLE_NAMES: ["test_table"],
+        "aws.table_name": ["test_table"],
+    }
+)
+_SQS_QUEUE_NAME_ATTRIBUTES: Mapping[str, Any] = MappingProxyType({_AWS_SQS_QUEUE_NAME: "test_queue"})
+_SQS_QUEUE_URL_ATTRIBUTES: Mapping[str, Any] = MappingProxyType(
+    {_AWS_SQS_QUEUE_URL: "http://sqs.us-east-1.localstack:4566/000000000000/test_queue"}
+)
+_KINESIS_STREAM_ATTRIBUTES: Mapping[str, Any] = MappingProxyType({_AWS_KINESIS_STREAM_NAME: "test_stream"})
+_KINESIS_ERROR_STREAM_ATTRIBUTES: Mapping[str, Any] = MappingProxyType({_AWS_KINESIS_STREAM_NAME: "test_stream_error"})
+_BEDROCK_GUARDRAIL_ATTRIBUTES: Mapping[str, Any] = MappingProxyType({_AWS_BEDROCK_GUARDRAIL_ID: "test-guardrail"})
+_BEDROCK_MODEL_ATTRIBUTES: Mapping[str, Any] = MappingProxyType({_GEN_AI_REQUEST_MODEL: "test-model"})
+_BEDROCK_AGENT_ATTRIBUTES: Mapping[str, Any] = MappingProxyType({_AWS_BEDROCK_AGENT_ID: "test-agent"})
+_BEDROCK_KNOWLEDGE_BASE_ATTRIBUTES: Mapping[str, Any] = MappingProxyType(
+    {_AWS_BEDROCK_KNOWLEDGE_BASE_ID: "test-knowledge-base"}
+)
+_BEDROCK_DATA_SOURCE_ATTRIBUTES: Mapping[str, Any] = MappingProxyType({_AWS_BEDROCK_DATA_SOURCE_ID: "test-data-source"})
+
+
+def _get_local_operation(data_point: ExponentialHistogramDataPoint) -> Optional[str]:
+    # Stops at the first match, without building a dict of all the data point's attributes.
+    return next(
+        (attribute.value.string_value for attribute in data_point.attributes if attribute.key == AWS_LOCAL_OPERATION),
+        None,
+    )
+
+
+@dataclass(frozen=True)
+class _AwsSdkCase:
+    """An AWS SDK call made through the sample application, along with the telemetry it is expected to produce."""
+
+    name: str
+    path: str
+    status_code: int
+    expected_error: int
+    expected_fault: int
+    remote_service: str
+    remote_operation: str
+    remote_resource_type: str
+    remote_resource_identifier: Union[str, Pattern[str]]
+    request_specific_attributes: Mapping[str, Any]
+    span_name: str
+    rpc_service: Optional[str] = None
+    method: str = "GET"
+
+
+_CASES: Tuple[_AwsSdkCase, ...] = (
+    _AwsSdkCase(
+        name="s3_create_bucket",
+        path="s3/createbucket/create-bucket/test-bucket-name",
+        status_code=200,
+        expected_error=0,
+        expected_fault=0,
+        remote_service="AWS::S3",
+        remote_operation="PutBucket",
+        remote_resource_type="AWS::S3::Bucket",
+        remote_resource_identifier="test-bucket-name",
+        request_specific_attributes=_S3_BUCKET_ATTRIBUTES,
+        span_name="S3.PutBucket",
+    ),
+    _AwsSdkCase(
+        name="s3_create_object",
+        path="s3/createobject/put-object/some-object/test-bucket-name",
+        status_code=200,
+        expected_error=0,
+        expected_fault=0,
+        remote_service="AWS::S3",
+        remote_operation="PutObject",
+        remote_resource_type="AWS::S3::Bucket",
+        remote_resource_identifier="test-bucket-name",
+        request_specific_attributes=_S3_BUCKET_ATTRIBUTES,
+        span_name="S3.PutObject",
+    ),
+    _AwsSdkCase(
+        name="s3_delete_object",
+        path="s3/deleteobject/delete-object/some-object/test-bucket-name",
+        status_code=204,
+        expected_error=0,
+        expected_fault=0,
+        remote_service="AWS::S3",
+        remote_operation="DeleteObject",
+        remote_resource_type="AWS::S3::Bucket",
+        remote_resource_identifier="test-bucket-name",
+        request_specific_attributes=_S3_BUCKET_ATTRIBUTES,
+        span_name="S3.DeleteObject",
+    ),
+    _AwsSdkCase(
+        name="dynamodb_create_table",
+        path="ddb/createtable/some-table",
+        status_code=200,
+        expected_error=0,
+        expected_fault=0,
+        remote_service="AWS::DynamoDB",
+        remote_operation="CreateTable",
+        remote_resource_type="AWS::DynamoDB::Table",
+        remote_resource_identifier="test_table",
+        request_specific_attributes=_DYNAMODB_TABLE_ATTRIBUTES,
+        span_name="DynamoDB.CreateTable",
+    ),
+    _AwsSdkCase(
+        name="dynamodb_put_item",
+        path="ddb/put-item/some-item",
+        status_code=200,
+        expected_error=0,
+        expected_fault=0,
+        remote_service="AWS::DynamoDB",
+        remote_operation="PutItem",
+        remote_resource_type="AWS::DynamoDB::Table",
+        remote_resource_identifier="test_table",
+        request_specific_attributes=_DYNAMODB_TABLE_ATTRIBUTES,
+        span_name="DynamoDB.PutItem",
+    ),
+    _AwsSdkCase(
+        name="sqs_create_queue",
+        path="sqs/createqueue/some-queue",
+        status_code=200,
+        expected_error=0,
+        expected_fault=0,
+        remote_service="AWS::SQS",
+        remote_operation="CreateQueue",
+        remote_resource_type="AWS::SQS::Queue",
+        remote_resource_identifier="test_queue",
+        request_specific_attributes=_SQS_QUEUE_NAME_ATTRIBUTES,
+        span_name="SQS.CreateQueue",
+    ),
+    _AwsSdkCase(
+        name="sqs_send_message",
+        path="sqs/publishqueue/some-queue",
+        status_code=200,
+        expected_error=0,
+        expected_fault=0,
+        remote_service="AWS::SQS",
+        remote_operation="SendMessage",
+        remote_resource_type="AWS::SQS::Queue",
+        remote_resource_identifier="test_queue",
+        request_specific_attributes=_SQS_QUEUE_URL_ATTRIBUTES,
+        span_name="SQS.SendMessage",
+    ),
+    _AwsSdkCase(
+        name="sqs_receive_message",
+        path="sqs/consumequeue/some-queue",
+        status_code=200,
+        expected_error=0,
+        expected_fault=0,
+        remote_service="AWS::SQS",
+        remote_operation="ReceiveMessage",
+        remote_resource_type="AWS::SQS::Queue",
+        remote_resource_identifier="test_queue",
+        request_specific_attributes=_SQS_QUEUE_URL_ATTRIBUTES,
+        span_name="SQS.ReceiveMessage",
+    ),
+    _AwsSdkCase(
+        name="kinesis_create_stream",
+        path="kinesis/createstream/my-stream",
+        status_code=200,
+        expected_error=0,
+        expected_fault=0,
+        remote_service="AWS::Kinesis",
+        remote_operation="CreateStream",
+        remote_resource_type="AWS::Kinesis::Stream",
+        remote_resource_identifier="test_stream",
+        request_specific_attributes=_KINESIS_STREAM_ATTRIBUTES,
+        span_name="Kinesis.CreateStream",
+    ),
+    _AwsSdkCase(
+        name="kinesis_put_record",
+        path="kinesis/putrecord/my-stream",
+        status_code=200,
+        expected_error=0,
+        expected_fault=0,
+        remote_service="AWS::Kinesis",
+        remote_operation="PutRecord",
+        remote_resource_type="AWS::Kinesis::Stream",
+        remote_resource_identifier="test_stream",
+        request_specific_attributes=_KINESIS_STREAM_ATTRIBUTES,
+        span_name="Kinesis.PutRecord",
+    ),
+    _AwsSdkCase(
+        name="kinesis_error",
+        path="kinesis/error",
+        status_code=400,
+        expected_error=1,
+        expected_fault=0,
+        remote_service="AWS::Kinesis",
+        remote_operation="DeleteStream",
+        remote_resource_type="AWS::Kinesis::Stream",
+        remote_resource_identifier="test_stream_error",
+        request_specific_attributes=_KINESIS_ERROR_STREAM_ATTRIBUTES,
+        span_name="Kinesis.DeleteStream",
+    ),
+    # TODO: https://github.com/aws-observability/aws-otel-dotnet-instrumentation/issues/83
+    # _AwsSdkCase(
+    #     name="kinesis_fault",
+    #     path="kinesis/fault",
+    #     status_code=500,
+    #     expected_error=0,
+    #     expected_fault=1,
+    #     remote_service="AWS::Kinesis",
+    #     remote_operation="CreateStream",
+    #     remote_resource_type="AWS::Kinesis::Stream",
+    #     remote_resource_identifier="test_stream",
+    #     request_specific_attributes=_KINESIS_STREAM_ATTRIBUTES,
+    #     span_name="Kinesis.CreateStream",
+    # ),
+    _AwsSdkCase(
+        name="bedrock_get_guardrail",
+        path="bedrock/getguardrail/get-guardrail",
+        status_code=200,
+        expected_error=0,
+        expected_fault=0,
+        rpc_service="Bedrock",
+        remote_service="AWS::Bedrock",
+        remote_operation="GetGuardrail",
+        remote_resource_type="AWS::Bedrock::Guardrail",
+        remote_resource_identifier="test-guardrail",
+        request_specific_attributes=_BEDROCK_GUARDRAIL_ATTRIBUTES,
+        span_name="Bedrock.GetGuardrail",
+    ),
+    _AwsSdkCase(
+        name="bedrock_runtime_invoke_model",
+        path="bedrock/invokemodel/invoke-model",
+        status_code=200,
+        expected_error=0,
+        expected_fault=0,
+        rpc_service="Bedrock Runtime",
+        remote_service="AWS::BedrockRuntime",
+        remote_operation="InvokeModel",
+        remote_resource_type="AWS::Bedrock::Model",
+        remote_resource_identifier="test-model",
+        request_specific_attributes=_BEDROCK_MODEL_ATTRIBUTES,
+        span_name="Bedrock Runtime.InvokeModel",
+    ),
+    _AwsSdkCase(
+        name="bedrock_agent_runtime_invoke_agent",
+        path="bedrock/invokeagent/invoke-agent",
+        status_code=200,
+        expected_error=0,
+        expected_fault=0,
+        rpc_service="Bedrock Agent Runtime",
+        remote_service="AWS::Bedrock",
+        remote_operation="InvokeAgent",
+        remote_resource_type="AWS::Bedrock::Agent",
+        remote_resource_identifier="test-agent",
+        request_specific_attributes=_BEDROCK_AGENT_ATTRIBUTES,
+        span_name="Bedrock Agent Runtime.InvokeAgent",
+    ),
+    _AwsSdkCase(
+        name="bedrock_agent_runtime_retrieve",
+        path="bedrock/retrieve/retrieve",
+        status_code=200,
+        expected_error=0,
+        expected_fault=0,
+        rpc_service="Bedrock Agent Runtime",
+        remote_service="AWS::Bedrock",
+        remote_operation="Retrieve",
+        remote_resource_type="AWS::Bedrock::KnowledgeBase",
+        remote_resource_identifier="test-knowledge-base",
+        request_specific_attributes=_BEDROCK_KNOWLEDGE_BASE_ATTRIBUTES,
+        span_name="Bedrock Agent Runtime.Retrieve",
+    ),
+    _AwsSdkCase(
+        name="bedrock_agent_get_agent",
+        path="bedrock/getagent/get-agent",
+        status_code=200,
+        expected_error=0,
+        expected_fault=0,
+        rpc_service="Bedrock Agent",
+        remote_service="AWS::Bedrock",
+        remote_operation="GetAgent",
+        remote_resource_type="AWS::Bedrock::Agent",
+        remote_resource_identifier="test-agent",
+        request_specific_attributes=_BEDROCK_AGENT_ATTRIBUTES,
+        span_name="Bedrock Agent.GetAgent",
+    ),
+    _AwsSdkCase(
+        name="bedrock_agent_get_knowledge_base",
+        path="bedrock/getknowledgebase/get-knowledge-base",
+        status_code=200,
+        expected_error=0,
+        expected_fault=0,
+        rpc_service="Bedrock Agent",
+        remote_service="AWS::Bedrock",
+        remote_operation="GetKnowledgeBase",
+        remote_resource_type="AWS::Bedrock::KnowledgeBase",
+        remote_resource_identifier="test-knowledge-base",
+        request_specific_attributes=_BEDROCK_KNOWLEDGE_BASE_ATTRIBUTES,
+        span_name="Bedrock Agent.GetKnowledgeBase",
+    ),
+    _AwsSdkCase(
+        name="bedrock_agent_get_data_source",
+        path="bedrock/getdatasource/get-data-source",
+        status_code=200,
+        expected_error=0,
+        expected_fault=0,
+        rpc_service="Bedrock Agent",
+        remote_service="AWS::Bedrock",
+        remote_operation="GetDataSource",
+        remote_resource_type="AWS::Bedrock::DataSource",
+        remote_resource_identifier="test-data-source",
+        request_specific_attributes=_BEDROCK_DATA_SOURCE_ATTRIBUTES,
+        span_name="Bedrock Agent.GetDataSource",
+    ),
+)
+
 
 # pylint: disable=too-many-public-methods
 class AWSSdkTest(ContractTestBase):
+    # LocalStack services exercised by the test cases, only these are started in the LocalStack container.
+    REQUIRED_SERVICES: Tuple[str, ...] = ("s3", "sqs", "dynamodb", "kinesis")
+    # All state lives in LocalStack, which is already shared by the class, so the application can be shared too.
+    REUSE_APPLICATION: bool = True
+    DEPENDENCY_IMAGES: Tuple[str, ...] = (LOCAL_STACK_IMAGE,)
+
     _local_stack: LocalStackContainer
+    # Span list the client span below was selected from, see _get_client_span.
+    _client_span_source: Optional[List[ResourceScopeSpan]] = None
+    _client_span: Optional[Tuple[Span, Dict[str, AnyValue]]] = None
 
-    def get_application_extra_environment_variables(self) -> Dict[str, str]:
-        return {
-            "AWS_SDK_S3_ENDPOINT": "http://s3.localstack:4566",
-            "AWS_SDK_ENDPOINT": "http://localstack:4566",
-            "AWS_REGION": "us-west-2",
-            "AWS_ACCESS_KEY_ID": "testcontainers-localstack",
-            "AWS_SECRET_ACCESS_KEY": "testcontainers-localstack"
-        }
+    @override
+    def get_application_extra_environment_variables(self) -> Mapping[str, str]:
+        return _APPLICATION_ENVIRONMENT_VARIABLES
 
     @override
-    def get_application_network_aliases(self) -> List[str]:
-        return ["error.test", "fault.test"]
+    def get_application_network_aliases(self) -> Tuple[str, ...]:
+        return _APPLICATION_NETWORK_ALIASES
 
     @override
     def get_application_image_name(self) -> str:
@@ -64,421 +422,128 @@ class AWSSdkTest(ContractTestBase):
     @classmethod
     @override
     def set_up_dependency_container(cls):
-        local_stack_networking_config: Dict[str, EndpointConfig] = {
-            NETWORK_NAME: EndpointConfig(
-                version="1.22",
-                aliases=[
-                    "localstack",
-                    "s3.localstack",
-                ],
-            )
-        }
         cls._local_stack: LocalStackContainer = (
-            LocalStackContainer(image="localstack/localstack:3.0.2")
-            .with_name("localstack")
-            .with_services("s3", "sqs", "dynamodb", "kinesis")
+            LocalStackContainer(image=LOCAL_STACK_IMAGE)
+            .with_name(get_container_name("localstack"))
+            .with_services(*cls.REQUIRED_SERVICES)
             .with_env("DEFAULT_REGION", "us-west-2")
-            .with_kwargs(network=NETWORK_NAME, networking_config=local_stack_networking_config)
+            .with_env("EAGER_SERVICE_LOADING", "1")
+            .with_env("SKIP_INFRA_DOWNLOADS", "1")
+            .with_env("PERSISTENCE", "0")
+            # Turn off usage analytics, debug logging and the certificate download at startup. None of these affect
+            # the behaviour of the emulated services.
+            .with_env("DISABLE_EVENTS", "1")
+            .with_env("DEBUG", "0")
+            .with_env("SKIP_SSL_CERT_DOWNLOAD", "1")
+            # Service state does not need to outlive the container, keep it in memory rather than on OverlayFS.
+            .with_kwargs(
+                network=NETWORK_NAME,
+                networking_config=_LOCAL_STACK_NETWORKING_CONFIG,
+                tmpfs={"/var/lib/localstack": "rw,size=512m"},
+                cpu_shares=CONTAINER_CPU_SHARES,
+            )
+        )
+        wait_for_image(LOCAL_STACK_IMAGE)
+        # LocalStackContainer.start() waits for a "Ready." log line, which is slow and flaky. Start the container
+        # directly and wait on the health endpoint for the required services instead.
+        DockerContainer.start(cls._local_stack)
+        cls._wait_for_local_stack_health()
+
+    @classmethod
+    def _wait_for_local_stack_health(cls) -> None:
+        health_url: str = f"{cls._local_stack.get_url()}/_localstack/health"
+        deadline: float = time.monotonic() + _LOCAL_STACK_STARTUP_TIMEOUT_SEC
+        while time.monotonic() < deadline:
+            try:
+                response: Response = request("GET", health_url, timeout=5)
+                services: Dict[str, str] = response.json().get("services", {})
+                if all(services.get(service) in _LOCAL_STACK_READY_STATES for service in cls.REQUIRED_SERVICES):
+                    return
+            except (RequestException, ValueError):
+                pass
+            time.sleep(_LOCAL_STACK_HEALTH_INTERVAL_SEC)
+        raise TimeoutError(
+            f"LocalStack services {cls.REQUIRED_SERVICES} not ready after {_LOCAL_STACK_STARTUP_TIMEOUT_SEC} seconds"
         )
-        cls._local_stack.start()
 
 
     @classmethod
     @override
     def tear_down_dependency_container(cls):
-        _logger.info("LocalStack stdout")
-        _logger.info(cls._local_stack.get_logs()[0].decode())
-        _logger.info("LocalStack stderr")
-        _logger.info(cls._local_stack.get_logs()[1].decode())
+        if cls.has_failed_test:
+            # Only read the tail of the logs, a LocalStack running several services can produce a lot of output.
+            local_stack_container: Container = cls._local_stack.get_wrapped_container()
+            _logger.info("LocalStack stdout")
+            _logger.info(local_stack_container.logs(stdout=True, stderr=False, tail=_LOCAL_STACK_LOG_TAIL).decode())
+            _logger.info("LocalStack stderr")
+            _logger.info(local_stack_container.logs(stdout=False, stderr=True, tail=_LOCAL_STACK_LOG_TAIL).decode())
+        else:
+            _logger.info("LocalStack logs suppressed (all tests passed)")
         cls._local_stack.stop()
 
-    def test_s3_create_bucket(self):
-        self.do_test_requests(
-            "s3/createbucket/create-bucket/test-bucket-name",
-            "GET",
-            200,
-            0,
-            0,
-            remote_service="AWS::S3",
-            remote_operation="PutBucket",
-            remote_resource_type="AWS::S3::Bucket",
-            remote_resource_identifier="test-bucket-name",
-            request_specific_attributes={
-                SpanAttributes.AWS_S3_BUCKET: "test-bucket-name",
-            },
-            span_name="S3.PutBucket",
-        )
-
-    def test_s3_create_object(self):
-        self.do_test_requests(
-            "s3/createobject/put-object/some-object/test-bucket-name",
-            "GET",
-            200,
-            0,
-            0,
-            remote_service="AWS::S3",
-            remote_operation="PutObject",
-            remote_resource_type="AWS::S3::Bucket",
-            remote_resource_identifier="test-bucket-name",
-            request_specific_attributes={
-                SpanAttributes.AWS_S3_BUCKET: "test-bucket-name",
-            },
-            span_name="S3.PutObject",
-        )
-
-    def test_s3_delete_object(self):
-        self.do_test_requests(
-            "s3/deleteobject/delete-object/some-object/test-bucket-name",
-            "GET",
-            204,
-            0,
-            0,
-            remote_service="AWS::S3",
-            remote_operation="DeleteObject",
-            remote_resource_type="AWS::S3::Bucket",
-            remote_resource_identifier="test-bucket-name",
-            request_specific_attributes={
-                SpanAttributes.AWS_S3_BUCKET: "test-bucket-name",
-            },
-            span_name="S3.DeleteObject",
-        )
-
-    def test_dynamodb_create_table(self):
-        self.do_test_requests(
-            "ddb/createtable/some-table",
-            "GET",
-            200,
-            0,
-            0,
-            remote_service="AWS::DynamoDB",
-            remote_operation="CreateTable",
-            remote_resource_type="AWS::DynamoDB::Table",
-            remote_resource_identifier="test_table",
-            request_specific_attributes={
-                # SpanAttributes.AWS_DYNAMODB_TABLE_NAMES: ["test_table"],
-                "aws.table_name": ["test_table"],
-            },
-            span_name="DynamoDB.CreateTable",
-        )
-
-    def test_dynamodb_put_item(self):
-        self.do_test_requests(
-            "ddb/put-item/some-item",
-            "GET",
-            200,
-            0,
-            0,
-            remote_service="AWS::DynamoDB",
-            remote_operation="PutItem",
-            remote_resource_type="AWS::DynamoDB::Table",
-            remote_resource_identifier="test_table",
-            request_specific_attributes={
-                # SpanAttributes.AWS_DYNAMODB_TABLE_NAMES: ["test_table"],
-                "aws.table_name": ["test_table"],
-            },
-            span_name="DynamoDB.PutItem",
-        )
-
-    def test_sqs_create_queue(self):
-        self.do_test_requests(
-            "sqs/createqueue/some-queue",
-            "GET",
-            200,
-            0,
-            0,
-            remote_service="AWS::SQS",
-            remote_operation="CreateQueue",
-            remote_resource_type="AWS::SQS::Queue",
-            remote_resource_identifier="test_queue",
-            request_specific_attributes={
-                _AWS_SQS_QUEUE_NAME: "test_queue",
-            },
-            span_name="SQS.CreateQueue",
-        )
-
-    def test_sqs_send_message(self):
-        self.do_test_requests(
-            "sqs/publishqueue/some-queue",
-            "GET",
-            200,
-            0,
-            0,
-            remote_service="AWS::SQS",
-            remote_operation="SendMessage",
-            remote_resource_type="AWS::SQS::Queue",
-            remote_resource_identifier="test_queue",
-            request_specific_attributes={
-                _AWS_SQS_QUEUE_URL: "http://sqs.us-east-1.localstack:4566/000000000000/test_queue",
-            },
-            span_name="SQS.SendMessage",
-        )
-
-    def test_sqs_receive_message(self):
-        self.do_test_requests(
-            "sqs/consumequeue/some-queue",
-            "GET",
-            200,
-            0,
-            0,
-            remote_service="AWS::SQS",
-            remote_operation="ReceiveMessage",
-            remote_resource_type="AWS::SQS::Queue",
-            remote_resource_identifier="test_queue",
-            request_specific_attributes={
-                _AWS_SQS_QUEUE_URL: "http://sqs.us-east-1.localstack:4566/000000000000/test_queue",
-            },
-            span_name="SQS.ReceiveMessage",
-        )
-
-    def test_kinesis_create_stream(self):
-        self.do_test_requests(
-            "kinesis/createstream/my-stream",
-            "GET",
-            200,
-            0,
-            0,
-            remote_service="AWS::Kinesis",
-            remote_operation="CreateStream",
-            remote_resource_type="AWS::Kinesis::Stream",
-            remote_resource_identifier="test_stream",
-            request_specific_attributes={
-                _AWS_KINESIS_STREAM_NAME: "test_stream",
-            },
-            span_name="Kinesis.CreateStream",
-        )
-
-    def test_kinesis_put_record(self):
-        self.do_test_requests(
-            "kinesis/putrecord/my-stream",
-            "GET",
-            200,
-            0,
-            0,
-            remote_service="AWS::Kinesis",
-            remote_operation="PutRecord",
-            remote_resource_type="AWS::Kinesis::Stream",
-            remote_resource_identifier="test_stream",
-            request_specific_attributes={
-                _AWS_KINESIS_STREAM_NAME: "test_stream",
-            },
-            span_name="Kinesis.PutRecord",
-        )
-
-    def test_kinesis_error(self):
-        self.do_test_requests(
-            "kinesis/error",
-            "GET",
-            400,
-            1,
-            0,
-            remote_service="AWS::Kinesis",
-            remote_operation="DeleteStream",
-            remote_resource_type="AWS::Kinesis::Stream",
-            remote_resource_identifier="test_stream_error",
-            request_specific_attributes={
-                _AWS_KINESIS_STREAM_NAME: "test_stream_error",
-            },
-            span_name="Kinesis.DeleteStream",
-        )
-
-    # TODO: https://github.com/aws-observability/aws-otel-dotnet-instrumentation/issues/83
-    # def test_kinesis_fault(self):
-    #     self.do_test_requests(
-    #         "kinesis/fault",
-    #         "GET",
-    #         500,
-    #         0,
-    #         1,
-    #         remote_service="AWS::Kinesis",
-    #         remote_operation="CreateStream",
-    #         remote_resource_type="AWS::Kinesis::Stream",
-    #         remote_resource_identifier="test_stream",
-    #         request_specific_attributes={
-    #             _AWS_KINESIS_STREAM_NAME: "test_stream",
-    #         },
-    #         span_name="Kinesis.CreateStream",
-    #     )
-
-    def test_bedrock_get_guardrail(self):
-        self.do_test_requests(
-            "bedrock/getguardrail/get-guardrail",
-            "GET",
-            200,
-            0,
-            0,
-            rpc_service="Bedrock",
-            remote_service="AWS::Bedrock",
-            remote_operation="GetGuardrail",
-            remote_resource_type="AWS::Bedrock::Guardrail",
-            remote_resource_identifier="test-guardrail",
-            request_specific_attributes={
-                _AWS_BEDROCK_GUARDRAIL_ID: "test-guardrail",
-            },
-            span_name="Bedrock.GetGuardrail",
-        )
-
-    def test_bedrock_runtime_invoke_model(self):
-        self.do_test_requests(
-            "bedrock/invokemodel/invoke-model",
-            "GET",
-            200,
-            0,
-            0,
-            rpc_service="Bedrock Runtime",
-            remote_service="AWS::BedrockRuntime",
-            remote_operation="InvokeModel",
-            remote_resource_type="AWS::Bedrock::Model",
-            remote_resource_identifier="test-model",
-            request_specific_attributes={
-                _GEN_AI_REQUEST_MODEL: "test-model",
-            },
-            span_name="Bedrock Runtime.InvokeModel",
-        )
-
-    def test_bedrock_agent_runtime_invoke_agent(self):
-        self.do_test_requests(
-            "bedrock/invokeagent/invoke-agent",
-            "GET",
-            200,
-            0,
-            0,
-            rpc_service="Bedrock Agent Runtime",
-            remote_service="AWS::Bedrock",
-            remote_operation="InvokeAgent",
-            remote_resource_type="AWS::Bedrock::Agent",
-            remote_resource_identifier="test-agent",
-            request_specific_attributes={
-                _AWS_BEDROCK_AGENT_ID: "test-agent",
-            },
-            span_name="Bedrock Agent Runtime.InvokeAgent",
-        )
-
-    def test_bedrock_agent_runtime_retrieve(self):
-        self.do_test_requests(
-            "bedrock/retrieve/retrieve",
-            "GET",
-            200,
-            0,
-            0,
-            rpc_service="Bedrock Agent Runtime",
-            remote_service="AWS::Bedrock",
-            remote_operation="Retrieve",
-            remote_resource_type="AWS::Bedrock::KnowledgeBase",
-            remote_resource_identifier="test-knowledge-base",
-            request_specific_attributes={
-                _AWS_BEDROCK_KNOWLEDGE_BASE_ID: "test-knowledge-base",
-            },
-            span_name="Bedrock Agent Runtime.Retrieve",
-        )
-
-    def test_bedrock_agent_get_agent(self):
-        self.do_test_requests(
-            "bedrock/getagent/get-agent",
-            "GET",
-            200,
-            0,
-            0,
-            rpc_service="Bedrock Agent",
-            remote_service="AWS::Bedrock",
-            remote_operation="GetAgent",
-            remote_resource_type="AWS::Bedrock::Agent",
-            remote_resource_identifier="test-agent",
-            request_specific_attributes={
-                _AWS_BEDROCK_AGENT_ID: "test-agent",
-            },
-            span_name="Bedrock Agent.GetAgent",
-        )
+    def _get_client_span(self, resource_scope_spans: List[ResourceScopeSpan]) -> Tuple[Span, Dict[str, AnyValue]]:
+        # Both span hooks are given the same span list, so select its single client span and build that span's
+        # attributes dict only once. The list itself is kept, rather than its id, so that a later list is never
+        # mistaken for it.
+        if self._client_span_source is not resource_scope_spans:
+            # pylint: disable=no-member
+            client_kind: int = Span.SPAN_KIND_CLIENT
+            target_spans: List[Span] = [rss.span for rss in resource_scope_spans if rss.span.kind == client_kind]
 
-    def test_bedrock_agent_get_knowledge_base(self):
-        self.do_test_requests(
-            "bedrock/getknowledgebase/get-knowledge-base",
-            "GET",
-            200,
-            0,
-            0,
-            rpc_service="Bedrock Agent",
-            remote_service="AWS::Bedrock",
-            remote_operation="GetKnowledgeBase",
-            remote_resource_type="AWS::Bedrock::KnowledgeBase",
-            remote_resource_identifier="test-knowledge-base",
-            request_specific_attributes={
-                _AWS_BEDROCK_KNOWLEDGE_BASE_ID: "test-knowledge-base",
-            },
-            span_name="Bedrock Agent.GetKnowledgeBase",
-        )
-
-    def test_bedrock_agent_get_data_source(self):
-        self.do_test_requests(
-            "bedrock/getdatasource/get-data-source",
-            "GET",
-            200,
-            0,
-            0,
-            rpc_service="Bedrock Agent",
-            remote_service="AWS::Bedrock",
-            remote_operation="GetDataSource",
-            remote_resource_type="AWS::Bedrock::DataSource",
-            remote_resource_identifier="test-data-source",
-            request_specific_attributes={
-                _AWS_BEDROCK_DATA_SOURCE_ID: "test-data-source",
-            },
-            span_name="Bedrock Agent.GetDataSource",
-        )
+            self.assertEqual(len(target_spans), 1)
+            self._client_span = (target_spans[0], self._get_attributes_dict(target_spans[0].attributes))
+            self._client_span_source = resource_scope_spans
+        return self._client_span
 
     @override
     def _assert_aws_span_attributes(self, resource_scope_spans: List[ResourceScopeSpan], path: str, **kwargs) -> None:
-        target_spans: List[Span] = []
-        for resource_scope_span in resource_scope_spans:
-            # pylint: disable=no-member
-            if resource_scope_span.span.kind == Span.SPAN_KIND_CLIENT:
-                target_spans.append(resource_scope_span.span)
-
-        self.assertEqual(len(target_spans), 1)
+        _, attributes_dict = self._get_client_span(resource_scope_spans)
         self._assert_aws_attributes(
-            target_spans[0].attributes,
+            attributes_dict,
             kwargs.get("remote_service"),
             kwargs.get("remote_operation"),
             "CLIENT",
-            kwargs.get("remote_resource_type", "None"),
-            kwargs.get("remote_resource_identifier", "None"),
+            kwargs.get("remote_resource_type"),
+            kwargs.get("remote_resource_identifier"),
         )
 
     def _assert_aws_attributes(
         self,
-        attributes_list: List[KeyValue],
+        attributes_dict: Dict[str, AnyValue],
         service: str,
         operation: str,
         span_kind: str,
-        remote_resource_type: str,
-        remote_resource_identifier: str,
+        remote_resource_type: Optional[str],
+        remote_resource_identifier: Optional[Union[str, Pattern[str]]],
     ) -> None:
-        attributes_dict: Dict[str, AnyValue] = self._get_attributes_dict(attributes_list)
-        self._assert_str_attribute(attributes_dict, AWS_LOCAL_SERVICE, self.get_application_otel_service_name())
+        self._assert_str_attribute(attributes_dict, AWS_LOCAL_SERVICE, self._otel_service_name)
         self._assert_str_attribute(attributes_dict, AWS_REMOTE_SERVICE, service)
         self._assert_str_attribute(attributes_dict, AWS_REMOTE_OPERATION, operation)
-        if remote_resource_type != "None":
+        self._assert_str_attribute(attributes_dict, AWS_SPAN_KIND, span_kind)
+        self._assert_remote_resource_attributes(attributes_dict, remote_resource_type, remote_resource_identifier)
+
+    def _assert_remote_resource_attributes(
+        self,
+        attributes_dict: Dict[str, AnyValue],
+        remote_resource_type: Optional[str],
+        remote_resource_identifier: Optional[Union[str, Pattern[str]]],
+    ) -> None:
+        if remote_resource_type is not None:
             self._assert_str_attribute(attributes_dict, AWS_REMOTE_RESOURCE_TYPE, remote_resource_type)
-        if remote_resource_identifier != "None":
+        if remote_resource_identifier is not None:
             self._assert_str_attribute(attributes_dict, AWS_REMOTE_RESOURCE_IDENTIFIER, remote_resource_identifier)
-        self._assert_str_attribute(attributes_dict, AWS_SPAN_KIND, span_kind)
 
     @override
     def _assert_semantic_conventions_span_attributes(
         self, resource_scope_spans: List[ResourceScopeSpan], method: str, path: str, status_code: int, **kwargs
     ) -> None:
-        target_spans: List[Span] = []
-        for resource_scope_span in resource_scope_spans:
-            # pylint: disable=no-member
-            if resource_scope_span.span.kind == Span.SPAN_KIND_CLIENT:
-                target_spans.append(resource_scope_span.span)
-
-        self.assertEqual(len(target_spans), 1)
-        self.assertEqual(target_spans[0].name, kwargs.get("span_name"))
+        client_span, attributes_dict = self._get_client_span(resource_scope_spans)
+        self.assertEqual(client_span.name, kwargs.get("span_name"))
         self._assert_semantic_conventions_attributes(
-            target_spans[0].attributes,
+            attributes_dict,
             # For most cases, rpc_service is the same as the service name after "AWS::" prefix. Bedrock services are
             # the only exception to this, so we pass the rpc_service explicitly in the test case.
-            kwargs.get("rpc_service") if "rpc_service" in kwargs else kwargs.get("remote_service").split("::")[-1],
+            kwargs.get("rpc_service") or kwargs.get("remote_service").split("::")[-1],
             kwargs.get("remote_service"),
             kwargs.get("remote_operation"),
             status_code,
@@ -488,25 +553,30 @@ class AWSSdkTest(ContractTestBase):
     # pylint: disable=unidiomatic-typecheck
     def _assert_semantic_conventions_attributes(
         self,
-        attributes_list: List[KeyValue],
+        attributes_dict: Dict[str, AnyValue],
         rpc_service: str,
         service: str,
         operation: str,
         status_code: int,
-        request_specific_attributes: dict,
+        request_specific_attributes: Mapping[str, Any],
     ) -> None:
-        attributes_dict: Dict[str, AnyValue] = self._get_attributes_dict(attributes_list)
         self._assert_str_attribute(attributes_dict, SpanAttributes.RPC_METHOD, operation)
         self._assert_str_attribute(attributes_dict, SpanAttributes.RPC_SYSTEM, "aws-api")
         self._assert_str_attribute(attributes_dict, SpanAttributes.RPC_SERVICE, rpc_service)
         self._assert_int_attribute(attributes_dict, SpanAttributes.HTTP_STATUS_CODE, status_code)
+        # Bound once per span rather than per attribute, and looked up on the test so overrides are honoured.
+        assertions: Dict[type, _ValueAssertion] = {
+            value_type: getattr(self, name) for value_type, name in _VALUE_ASSERTIONS.items()
+        }
         for key, value in request_specific_attributes.items():
-            if isinstance(value, str):
-                self._assert_str_attribute(attributes_dict, key, value)
-            elif isinstance(value, int):
-                self._assert_int_attribute(attributes_dict, key, value)
-            else:
-                self._assert_array_value_ddb_table_name(attributes_dict, key, value)
+            assertion: Optional[_ValueAssertion] = assertions.get(type(value))
+            if assertion is None:
+                # Subclasses (e.g. bool) take the assertion of the first type they are an instance of.
+                assertion = next(
+                    (assertions[value_type] for value_type in assertions if isinstance(value, value_type)),
+                    self._assert_array_value_ddb_table_name,
+                )
+            assertion(attributes_dict, key, value)
 
     @override
     def _assert_metric_attributes(
@@ -529,50 +599,56 @@ class AWSSdkTest(ContractTestBase):
             dep_dp_list: List[ExponentialHistogramDataPoint] = dependency_target_metric.exponential_histogram.data_points
             dep_dp_list_count: int = kwargs.get("dp_count", 1)
             self.assertEqual(len(dep_dp_list), dep_dp_list_count)
-            dependency_dp: ExponentialHistogramDataPoint = dep_dp_list[0]
             service_dp_list = service_target_metric.exponential_histogram.data_points
             service_dp_list_count = kwargs.get("dp_count", 1)
             self.assertEqual(len(service_dp_list), service_dp_list_count)
-            service_dp: ExponentialHistogramDataPoint = service_dp_list[0]
-            if len(service_dp_list[0].attributes) > len(dep_dp_list[0].attributes):
-                dependency_dp = service_dp_list[0]
-                service_dp = dep_dp_list[0]
-            self._assert_dependency_dp_attributes(dependency_dp, expected_sum, metric_name, **kwargs)
-            self._assert_service_dp_attributes(service_dp, expected_sum, metric_name)
+            # The dependency data point carries the remote attributes on top of the service ones. The sort is stable,
+            # so the metric order is kept if the counts are equal.
+            dependency_dp, service_dp = sorted(
+                (dep_dp_list[0], service_dp_list[0]), key=lambda dp: len(dp.attributes), reverse=True
+            )
         elif (len(target_metrics) == 1):
             target_metric: Metric = target_metrics[0]
             dp_list: List[ExponentialHistogramDataPoint] = target_metric.exponential_histogram.data_points
             dp_list_count: int = kwargs.get("dp_count", 2)
             self.assertEqual(len(dp_list), dp_list_count)
-            dependency_dp: ExponentialHistogramDataPoint = dp_list[0]
-            service_dp: ExponentialHistogramDataPoint = dp_list[1]
-            if len(dp_list[1].attributes) > len(dp_list[0].attributes):
-                dependency_dp = dp_list[1]
-                service_dp = dp_list[0]
-            self._assert_dependency_dp_attributes(dependency_dp, expected_sum, metric_name, **kwargs)
-            self._assert_service_dp_attributes(service_dp, expected_sum, metric_name)
+            dependency_dp, service_dp = sorted(dp_list[:2], key=lambda dp: len(dp.attributes), reverse=True)
         else:
             raise AssertionError("Target metrics count is incorrect")
-    
-    def _assert_dependency_dp_attributes(self, dependency_dp: ExponentialHistogramDataPoint, expected_sum: int, metric_name: str, **kwargs):
-        attribute_dict = self._get_attributes_dict(dependency_dp.attributes)
-        self._assert_str_attribute(attribute_dict, AWS_LOCAL_SERVICE, self.get_application_otel_service_name())
+        self._assert_dependency_dp_attributes(
+            dependency_dp, self._get_attributes_dict(dependency_dp.attributes), expected_sum, metric_name, **kwargs
+        )
+        self._assert_service_dp_attributes(
+            service_dp, self._get_attributes_dict(service_dp.attributes), expected_sum, metric_name
+        )
+
+    def _assert_dependency_dp_attributes(
+        self,
+        dependency_dp: ExponentialHistogramDataPoint,
+        attribute_dict: Dict[str, AnyValue],
+        expected_sum: int,
+        metric_name: str,
+        **kwargs,
+    ) -> None:
+        self._assert_str_attribute(attribute_dict, AWS_LOCAL_SERVICE, self._otel_service_name)
         self._assert_str_attribute(attribute_dict, AWS_REMOTE_SERVICE, kwargs.get("remote_service"))
         self._assert_str_attribute(attribute_dict, AWS_REMOTE_OPERATION, kwargs.get("remote_operation"))
         self._assert_str_attribute(attribute_dict, AWS_SPAN_KIND, "CLIENT")
-        
-        remote_resource_type = kwargs.get("remote_resource_type", "None")
-        remote_resource_identifier = kwargs.get("remote_resource_identifier", "None")
-        if remote_resource_type != "None":
-            self._assert_str_attribute(attribute_dict, AWS_REMOTE_RESOURCE_TYPE, remote_resource_type)
-        if remote_resource_identifier != "None":
-            self._assert_str_attribute(attribute_dict, AWS_REMOTE_RESOURCE_IDENTIFIER, remote_resource_identifier)
-        
+        self._assert_remote_resource_attributes(
+            attribute_dict,
+            kwargs.get("remote_resource_type"),
+            kwargs.get("remote_resource_identifier"),
+        )
         self.check_sum(metric_name, dependency_dp.sum, expected_sum)
 
-    def _assert_service_dp_attributes(self, service_dp: ExponentialHistogramDataPoint, expected_sum: int, metric_name: str):
-        attribute_dict = self._get_attributes_dict(service_dp.attributes)
-        self._assert_str_attribute(attribute_dict, AWS_LOCAL_SERVICE, self.get_application_otel_service_name())
+    def _assert_service_dp_attributes(
+        self,
+        service_dp: ExponentialHistogramDataPoint,
+        attribute_dict: Dict[str, AnyValue],
+        expected_sum: int,
+        metric_name: str,
+    ) -> None:
+        self._assert_str_attribute(attribute_dict, AWS_LOCAL_SERVICE, self._otel_service_name)
         self._assert_str_attribute(attribute_dict, AWS_SPAN_KIND, "LOCAL_ROOT")
         self.check_sum(metric_name, service_dp.sum, expected_sum)
 
@@ -582,13 +658,50 @@ class AWSSdkTest(ContractTestBase):
         self.assertEqual(attributes_dict[key].string_value, expect_values[0])
 
     def _filter_bedrock_metrics(self, target_metrics: List[Metric]):
-        bedrock_calls = {"GET /agents", "GET /guardrails", "GET /knowledgebases", "POST /agents", "POST /model", "POST /knowledgebases" }
+        # Rebuild both lists rather than removing from them while iterating, which skipped the element after each
+        # removal.
+        survivors: List[Metric] = []
         for metric in target_metrics:
-            for dp in metric.exponential_histogram.data_points:
-                # remove dp generated from manual response
-                attribute_dict = self._get_attributes_dict(dp.attributes)
-                if attribute_dict['aws.local.operation'].string_value in bedrock_calls:
-                    metric.exponential_histogram.data_points.remove(dp)
+            data_points = metric.exponential_histogram.data_points
+            # remove dp generated from manual response
+            kept: List[ExponentialHistogramDataPoint] = [
+                dp for dp in data_points if _get_local_operation(dp) not in _BEDROCK_CALLS
+            ]
+            if len(kept) != len(data_points):
+                # Repeated proto fields cannot be assigned to, so replace the contents in place.
+                del data_points[:]
+                data_points.extend(kept)
             # remove Metric if it has no data points
-            if (len(metric.exponential_histogram.data_points) == 0):
-                target_metrics.remove(metric)
+            if kept:
+                survivors.append(metric)
+        target_metrics[:] = survivors
+
+
+def _make_test(case: _AwsSdkCase) -> Callable[[AWSSdkTest], None]:
+    def test(self: AWSSdkTest) -> None:
+        self.do_test_requests(
+            case.path,
+            case.method,
+            case.status_code,
+            case.expected_error,
+            case.expected_fault,
+            rpc_service=case.rpc_service,
+            remote_service=case.remote_service,
+            remote_operation=case.remote_operation,
+            remote_resource_type=case.remote_resource_type,
+            remote_resource_identifier=case.remote_resource_identifier,
+            request_specific_attributes=case.request_specific_attributes,
+            span_name=case.span_name,
+        )
+
+    # Name the generated method like a hand-written one, so tracebacks and unittest's verbose output identify the case.
+    test.__name__ = f"test_{case.name}"
+    test.__qualname__ = f"{AWSSdkTest.__name__}.{test.__name__}"
+    test.__doc__ = f"{case.span_name} ({case.method} /{case.path})"
+    return test
+
+
+# Each case becomes its own test method, so they are still reported, selected (-k) and distributed across pytest-xdist
+# workers individually.
+for _case in _CASES:
+    setattr(AWSSdkTest, f"test_{_case.name}", _make_test(_case))
@@ -1,11 +1,15 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
+import os
+import re
 import time
+from functools import cached_property
 from logging import INFO, Logger, getLogger
-from typing import Dict, List
+from typing import Dict, List, Mapping, Pattern, Sequence, Tuple, Union
 from unittest import TestCase
 
 from docker import DockerClient
+from docker.models.containers import Container
 from docker.models.networks import Network, NetworkCollection
 from docker.types import EndpointConfig
 from mock_collector_client import MockCollectorClient, ResourceScopeMetric, ResourceScopeSpan
@@ -17,13 +21,27 @@ from typing_extensions import override
 from amazon.utils.application_signals_constants import ERROR_METRIC, FAULT_METRIC, LATENCY_METRIC
 from opentelemetry.proto.common.v1.common_pb2 import AnyValue, KeyValue
 
-NETWORK_NAME: str = "aws-application-signals-network"
+# pytest-xdist exports the worker id (gw0, gw1, ...) to each worker process. Suffixing docker resource names with it
+# gives every worker its own network and containers, so network aliases stay unchanged and never clash across workers.
+_WORKER_SUFFIX: str = f"-{os.environ['PYTEST_XDIST_WORKER']}" if "PYTEST_XDIST_WORKER" in os.environ else ""
+NETWORK_NAME: str = "aws-application-signals-network" + _WORKER_SUFFIX
+# Double the default CPU weight (1024) of the containers exercised by the tests, so under CPU contention (e.g. in the
+# Docker Desktop VM) they are favoured over other containers running on the host.
+CONTAINER_CPU_SHARES: int = 2048
 
 _logger: Logger = getLogger(__name__)
 _logger.setLevel(INFO)
 _MOCK_COLLECTOR_ALIAS: str = "collector"
 _MOCK_COLLECTOR_NAME: str = "aws-application-signals-mock-collector"
 _MOCK_COLLECTOR_PORT: int = 4315
+# wait_for_logs polls every second by default, which is added to the startup of every application container.
+_LOG_WAIT_INTERVAL_SEC: float = 0.1
+# Lines of a reused application's logs shown when one of its tests fails. Its full logs are shown at class teardown.
+_APPLICATION_LOG_TAIL: int = 200
+
+
+def get_container_name(name: str) -> str:
+    return name + _WORKER_SUFFIX
 
 
 # pylint: disable=broad-exception-caught
@@ -41,6 +59,15 @@ class ContractTestBase(TestCase):
     mock_collector: DockerContainer
     mock_collector_client: MockCollectorClient
     network: Network
+    # Set by the pytest_runtest_makereport hook in conftest.py when any test of the class fails.
+    has_failed_test: bool = False
+    # Subclasses whose application keeps no state between requests can set this to share one application container
+    # across the tests of the class, instead of starting one per test.
+    REUSE_APPLICATION: bool = False
+    # Registry images of the dependency containers of the class, pulled in the background by conftest.py when any test
+    # of the class is selected.
+    DEPENDENCY_IMAGES: Tuple[str, ...] = ()
+    application_key: Tuple = None
 
     @classmethod
     @override
@@ -53,15 +80,19 @@ class ContractTestBase(TestCase):
         cls.mock_collector: DockerContainer = (
             DockerContainer(_MOCK_COLLECTOR_NAME)
             .with_exposed_ports(_MOCK_COLLECTOR_PORT)
-            .with_name(_MOCK_COLLECTOR_NAME)
+            .with_name(get_container_name(_MOCK_COLLECTOR_NAME))
             .with_kwargs(network=NETWORK_NAME, networking_config=mock_collector_networking_config)
         )
         cls.mock_collector.start()
-        wait_for_logs(cls.mock_collector, "Ready", timeout=20)
+        wait_for_logs(cls.mock_collector, "Ready", timeout=20, interval=_LOG_WAIT_INTERVAL_SEC)
         cls.set_up_dependency_container()
 
     @classmethod
     def class_tear_down(cls) -> None:
+        if cls.REUSE_APPLICATION and getattr(cls, "application", None) is not None:
+            cls._stop_application(cls.application)
+            cls.application = None
+
         try:
             cls.tear_down_dependency_container()
         except Exception:
@@ -81,10 +112,40 @@ class ContractTestBase(TestCase):
     @override
     def setUp(self) -> None:
         self.addCleanup(self.tear_down)
+        application_key: Tuple = self._get_application_key()
+        if self._can_reuse_application(application_key):
+            _logger.info("Reusing application container")
+        elif self.REUSE_APPLICATION:
+            # Only one application container can hold the container name, so stop the one started for other settings.
+            if getattr(type(self), "application", None) is not None:
+                self._stop_application(type(self).application)
+                # Not reused by later tests if starting the new one fails.
+                type(self).application = None
+            type(self).application = self._start_application()
+            type(self).application_key = application_key
+        else:
+            self.application: DockerContainer = self._start_application()
+        self.mock_collector_client: MockCollectorClient = MockCollectorClient(
+            self.mock_collector.get_container_host_ip(), self.mock_collector.get_exposed_port(_MOCK_COLLECTOR_PORT)
+        )
+        # Sleep for 100ms to ensure any startup metrics have been exported
+        time.sleep(0.1)
+        # Clear all start up metrics, so tests are only testing telemetry generated by their invocations.
+        self.mock_collector_client.clear_signals()
+
+    def tear_down(self) -> None:
+        # setUp may have failed before these were set; an application that failed to start is already stopped.
+        if not self.REUSE_APPLICATION and getattr(self, "application", None) is not None:
+            self._stop_application(self.application)
+
+        if getattr(self, "mock_collector_client", None) is not None:
+            self.mock_collector_client.clear_signals()
+
+    def _start_application(self) -> DockerContainer:
         application_networking_config: Dict[str, EndpointConfig] = {
             NETWORK_NAME: EndpointConfig(version="1.22", aliases=self.get_application_network_aliases())
         }
-        self.application: DockerContainer = (
+        application: DockerContainer = (
             DockerContainer(self.get_application_image_name())
             .with_exposed_ports(self.get_application_port())
             .with_env("OTEL_METRIC_EXPORT_INTERVAL", "50")
@@ -102,34 +163,81 @@ class ContractTestBase(TestCase):
             .with_env("CORECLR_ENABLE_PROFILING", "1")
             .with_env("CORECLR_PROFILER", "{918728DD-259F-4A6A-AC2B-B85E1B658318}")
             .with_env("RESOURCE_DETECTORS_ENABLED", "false")
-            .with_kwargs(network=NETWORK_NAME, networking_config=application_networking_config)
-            .with_name(self.get_application_image_name())
+            .with_kwargs(
+                network=NETWORK_NAME,
+                networking_config=application_networking_config,
+                cpu_shares=CONTAINER_CPU_SHARES,
+            )
+            .with_name(get_container_name(self.get_application_image_name()))
         )
 
-        extra_env: Dict[str, str] = self.get_application_extra_environment_variables()
+        extra_env: Mapping[str, str] = self.get_application_extra_environment_variables()
         for key in extra_env:
-            self.application.with_env(key, extra_env.get(key))
-        self.application.start()
-        wait_for_logs(self.application, self.get_application_wait_pattern(), timeout=1200)
-        self.mock_collector_client: MockCollectorClient = MockCollectorClient(
-            self.mock_collector.get_container_host_ip(), self.mock_collector.get_exposed_port(_MOCK_COLLECTOR_PORT)
-        )
-        # Sleep for 100ms to ensure any startup metrics have been exported
-        time.sleep(0.1)
-        # Clear all start up metrics, so tests are only testing telemetry generated by their invocations.
-        self.mock_collector_client.clear_signals()
-
-    def tear_down(self) -> None:
+            application.with_env(key, extra_env.get(key))
+        application.start()
+        try:
+            wait_for_logs(
+                application, self.get_application_wait_pattern(), timeout=1200, interval=_LOG_WAIT_INTERVAL_SEC
+            )
+        except Exception:
+            # The container is not handed to the caller, so dump its logs and stop it here. Otherwise it keeps running
+            # and holds the container name, making every later start fail with a name conflict.
+            self._stop_application(application)
+            raise
+        return application
+
+    @staticmethod
+    def _stop_application(application: DockerContainer) -> None:
         try:
             _logger.info("Application stdout")
-            _logger.info(self.application.get_logs()[0].decode())
+            _logger.info(application.get_logs()[0].decode())
             _logger.info("Application stderr")
-            _logger.info(self.application.get_logs()[1].decode())
-            self.application.stop()
+            _logger.info(application.get_logs()[1].decode())
+            application.stop()
         except Exception:
             _logger.exception("Failed to tear down application")
 
-        self.mock_collector_client.clear_signals()
+    def _get_application_key(self) -> Tuple:
+        return (
+            self.get_application_image_name(),
+            tuple(sorted(self.get_application_extra_environment_variables().items())),
+            tuple(self.get_application_network_aliases()),
+        )
+
+    def _can_reuse_application(self, application_key: Tuple) -> bool:
+        return (
+            self.REUSE_APPLICATION
+            and getattr(type(self), "application", None) is not None
+            and type(self).application_key == application_key
+            and self._is_running(type(self).application)
+        )
+
+    @staticmethod
+    def _is_running(application: DockerContainer) -> bool:
+        # A reused application may have crashed during an earlier test; start a new one rather than fail every test
+        # that follows.
+        try:
+            container: Container = application.get_wrapped_container()
+            container.reload()
+            return container.status == "running"
+        except Exception:
+            _logger.exception("Failed to get application container status")
+            return False
+
+    @classmethod
+    def log_application_tail(cls) -> None:
+        """Log the end of the reused application's logs. Called by conftest.py when a test of the class fails.
+
+        The failing test's cleanup has already run by then, but a reused application is only stopped at class teardown,
+        so its logs are still available.
+        """
+        if not cls.REUSE_APPLICATION or getattr(cls, "application", None) is None:
+            return
+        try:
+            _logger.info("Application logs (last %s lines)", _APPLICATION_LOG_TAIL)
+            _logger.info(cls.application.get_wrapped_container().logs(tail=_APPLICATION_LOG_TAIL).decode())
+        except Exception:
+            _logger.exception("Failed to get application logs")
 
     def do_test_requests(
         self, path: str, method: str, status_code: int, expected_error: int, expected_fault: int, **kwargs
@@ -140,33 +248,45 @@ class ContractTestBase(TestCase):
         response: Response = request(method, url, timeout=200)
         self.assertEqual(status_code, response.status_code)
 
-        resource_scope_spans: List[ResourceScopeSpan] = self.mock_collector_client.get_traces()
+        resource_scope_spans: List[ResourceScopeSpan]
+        metrics: List[ResourceScopeMetric]
+        resource_scope_spans, metrics = self.mock_collector_client.get_traces_and_metrics(
+            {LATENCY_METRIC, ERROR_METRIC, FAULT_METRIC}
+        )
         self._assert_aws_span_attributes(resource_scope_spans, path, **kwargs)
         self._assert_semantic_conventions_span_attributes(resource_scope_spans, method, path, status_code, **kwargs)
 
-        metrics: List[ResourceScopeMetric] = self.mock_collector_client.get_metrics(
-            {LATENCY_METRIC, ERROR_METRIC, FAULT_METRIC}
-        )
         self._assert_metric_attributes(metrics, LATENCY_METRIC, 12000, **kwargs)
         self._assert_metric_attributes(metrics, ERROR_METRIC, expected_error, **kwargs)
         self._assert_metric_attributes(metrics, FAULT_METRIC, expected_fault, **kwargs)
 
     def _get_attributes_dict(self, attributes_list: List[KeyValue]) -> Dict[str, AnyValue]:
-        attributes_dict: Dict[str, AnyValue] = {}
-        for attribute in attributes_list:
-            key: str = attribute.key
-            value: AnyValue = attribute.value
-            if key in attributes_dict:
-                old_value: AnyValue = attributes_dict[key]
-                self.fail(f"Attribute {key} unexpectedly duplicated. Value 1: {old_value} Value 2: {value}")
-            attributes_dict[key] = value
+        attributes_dict: Dict[str, AnyValue] = {attribute.key: attribute.value for attribute in attributes_list}
+        # Fewer keys than attributes means a key was duplicated; walk the list again only then, to report it.
+        if len(attributes_dict) != len(attributes_list):
+            seen: Dict[str, AnyValue] = {}
+            for attribute in attributes_list:
+                key: str = attribute.key
+                value: AnyValue = attribute.value
+                if key in seen:
+                    self.fail(f"Attribute {key} unexpectedly duplicated. Value 1: {seen[key]} Value 2: {value}")
+                seen[key] = value
         return attributes_dict
 
-    def _assert_str_attribute(self, attributes_dict: Dict[str, AnyValue], key: str, expected_value: str):
+    def _assert_str_attribute(
+        self, attributes_dict: Dict[str, AnyValue], key: str, expected_value: Union[str, Pattern[str]]
+    ):
         self.assertIn(key, attributes_dict)
         actual_value: AnyValue = attributes_dict[key]
         self.assertIsNotNone(actual_value)
-        self.assertEqual(expected_value, actual_value.string_value)
+        # Expected values that cannot be known up front (e.g. generated ids) are given as precompiled patterns.
+        if isinstance(expected_value, re.Pattern):
+            self.assertIsNotNone(
+                expected_value.fullmatch(actual_value.string_value),
+                f"{actual_value.string_value} does not match {expected_value.pattern}",
+            )
+        else:
+            self.assertEqual(expected_value, actual_value.string_value)
 
     def _assert_int_attribute(self, attributes_dict: Dict[str, AnyValue], key: str, expected_value: int) -> None:
         self.assertIn(key, attributes_dict)
@@ -174,6 +294,12 @@ class ContractTestBase(TestCase):
         self.assertIsNotNone(actual_value)
         self.assertEqual(expected_value, actual_value.int_value)
 
+    def _assert_float_attribute(self, attributes_dict: Dict[str, AnyValue], key: str, expected_value: float) -> None:
+        self.assertIn(key, attributes_dict)
+        actual_value: AnyValue = attributes_dict[key]
+        self.assertIsNotNone(actual_value)
+        self.assertEqual(expected_value, actual_value.double_value)
+
     def check_sum(self, metric_name: str, actual_sum: float, expected_sum: float) -> None:
         if metric_name is LATENCY_METRIC:
             self.assertTrue(0 < actual_sum < expected_sum)
@@ -193,11 +319,11 @@ class ContractTestBase(TestCase):
     def get_application_port(self) -> int:
         return 8080
 
-    def get_application_extra_environment_variables(self) -> Dict[str, str]:
+    def get_application_extra_environment_variables(self) -> Mapping[str, str]:
         return {}
 
-    def get_application_network_aliases(self) -> List[str]:
-        return []
+    def get_application_network_aliases(self) -> Sequence[str]:
+        return ()
 
     def get_application_image_name(self) -> str:
         return None
@@ -208,6 +334,11 @@ class ContractTestBase(TestCase):
     def get_application_otel_service_name(self) -> str:
         return self.get_application_image_name()
 
+    @cached_property
+    def _otel_service_name(self) -> str:
+        # The service name is fixed for a test class, and asserted on every span and data point.
+        return self.get_application_otel_service_name()
+
     def get_application_otel_resource_attributes(self) -> str:
         return "service.name=" + self.get_application_otel_service_name()
 
@@ -1,6 +1,6 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 from mock_collector_client import ResourceScopeMetric, ResourceScopeSpan
 from typing_extensions import override
@@ -20,10 +20,11 @@ from opentelemetry.proto.metrics.v1.metrics_pb2 import ExponentialHistogramDataP
 from opentelemetry.proto.trace.v1.trace_pb2 import Span
 from opentelemetry.trace import StatusCode
 
+from docker.types import EndpointConfig
 from testcontainers.postgres import PostgresContainer
 from typing_extensions import override
 
-from amazon.base.contract_test_base import NETWORK_NAME
+from amazon.base.contract_test_base import NETWORK_NAME, get_container_name
 from amazon.base.database_contract_test_base import (
     DATABASE_HOST,
     DATABASE_NAME,
@@ -34,17 +35,26 @@ from amazon.base.database_contract_test_base import (
     SPAN_KIND_LOCAL_ROOT,
     DatabaseContractTestBase,
 )
+from amazon.utils.docker_images import POSTGRES_IMAGE, wait_for_image
 
 
 class Psycopg2Test(DatabaseContractTestBase):
+    DEPENDENCY_IMAGES: Tuple[str, ...] = (POSTGRES_IMAGE,)
+
     @override
     @classmethod
     def set_up_dependency_container(cls) -> None:
         cls.container = (
-            PostgresContainer(user=DATABASE_USER, password=DATABASE_PASSWORD, dbname=DATABASE_NAME)
-            .with_kwargs(network=NETWORK_NAME)
-            .with_name(DATABASE_HOST)
+            PostgresContainer(
+                image=POSTGRES_IMAGE, user=DATABASE_USER, password=DATABASE_PASSWORD, dbname=DATABASE_NAME
+            )
+            .with_kwargs(
+                network=NETWORK_NAME,
+                networking_config={NETWORK_NAME: EndpointConfig(version="1.22", aliases=[DATABASE_HOST])},
+            )
+            .with_name(get_container_name(DATABASE_HOST))
         )
+        wait_for_image(POSTGRES_IMAGE)
         cls.container.start()
 
     @override
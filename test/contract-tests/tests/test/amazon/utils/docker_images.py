@@ -0,0 +1,49 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+"""
+Registry images used by the contract tests, and helpers to pull them ahead of the tests that need them.
+"""
+from logging import Logger, getLogger
+from threading import Thread
+from typing import Dict
+
+from docker import DockerClient
+from docker.errors import ImageNotFound
+
+_logger: Logger = getLogger(__name__)
+
+LOCAL_STACK_IMAGE: str = "localstack/localstack:3.0.2"
+MYSQL_IMAGE: str = "mysql:latest"
+POSTGRES_IMAGE: str = "postgres:latest"
+
+_image_pulls: Dict[str, Thread] = {}
+
+
+def prefetch_images(*images: str) -> None:
+    """Start pulling the given images in the background, so pulls overlap with test setup."""
+    for image in images:
+        if image not in _image_pulls:
+            pull: Thread = Thread(target=_pull_image, args=(image,), daemon=True)
+            pull.start()
+            _image_pulls[image] = pull
+
+
+def wait_for_image(image: str) -> None:
+    """Wait for a background pull of the image started by `prefetch_images`, if there is one."""
+    pull: Thread = _image_pulls.get(image)
+    if pull is not None:
+        pull.join()
+
+
+def _pull_image(image: str) -> None:
+    try:
+        client: DockerClient = DockerClient.from_env()
+        try:
+            client.images.get(image)
+        except ImageNotFound:
+            _logger.info("Pulling image %s", image)
+            client.images.pull(image)
+    # pylint: disable=broad-exception-caught
+    except Exception:
+        # Starting the container pulls the image again if needed, so a failed prefetch is not fatal.
+        _logger.exception("Failed to pull image %s", image)